@@ -123,6 +123,9 @@ CREATE TABLE siwaka_dishes.customerOrder (
         ON UPDATE CASCADE
 );
 
+-- Index used by archive.py to find old orders without scanning the whole table
+CREATE INDEX ix_customerOrder_orderDate ON siwaka_dishes.customerOrder (orderDate);
+
 -- Create productCategory Table
 CREATE TABLE siwaka_dishes.productCategory (
     productCategoryID INT AUTO_INCREMENT PRIMARY KEY,
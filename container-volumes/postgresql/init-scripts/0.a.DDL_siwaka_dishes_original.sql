@@ -111,6 +111,9 @@ CREATE TABLE customerOrder (
         ON UPDATE CASCADE
 );
 
+-- Index used by archive.py to find old orders without scanning the whole table
+CREATE INDEX ix_customerOrder_orderDate ON customerOrder (orderDate);
+
 -- Create productCategory Table
 CREATE TABLE productCategory (
     productCategoryID SERIAL PRIMARY KEY,
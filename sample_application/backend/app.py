@@ -2,16 +2,19 @@
 Role: Exposes the backend to the outside world through API endpoints.
 """
 
+from datetime import datetime, timedelta
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from db import SessionLocal, engine, Base
+from db import SessionLocal, ArchiveSessionLocal, engine, archive_engine, Base, ArchiveBase
 from services import (
     create_order_with_items,
     create_customer_order_with_products,
     get_selling_price_by_product_code,
+    get_customer_orders_by_date_range,
 )
 # Create tables on startup
 Base.metadata.create_all(bind=engine)
+ArchiveBase.metadata.create_all(bind=archive_engine)
 
 app = Flask(__name__)
 CORS(app, supports_credentials=False,
@@ -164,6 +167,37 @@ def api_get_selling_price(product_code: str):
     finally:
         session.close()
 
+"""
+Retrieves the customer orders placed in a date range (both dates inclusive).
+Orders that have been moved to the archive tables are included when the range needs them.
+
+Example:
+  GET /api/customer_orders?start_date=2024-01-01&end_date=2024-03-31
+"""
+@app.get("/api/customer_orders")
+def api_get_customer_orders():
+    try:
+        start_date = datetime.strptime(request.args.get("start_date", ""), "%Y-%m-%d")
+        end_date = datetime.strptime(request.args.get("end_date", ""), "%Y-%m-%d") + timedelta(days=1)
+    except ValueError:
+        return jsonify({"error": "start_date and end_date are required in the format YYYY-MM-DD"}), 400
+
+    session = SessionLocal()
+    archive_session = ArchiveSessionLocal() if archive_engine is not engine else None
+    try:
+        result = get_customer_orders_by_date_range(
+            session,
+            start_date=start_date,
+            end_date=end_date,
+            archive_session=archive_session
+        )
+        status = 200 if "error" not in result else 400
+        return jsonify(result), status
+    finally:
+        session.close()
+        if archive_session is not None:
+            archive_session.close()
+
 if __name__ == '__main__':
     app.run(debug=True)
 # if __name__ == '__main__':
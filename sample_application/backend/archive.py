@@ -0,0 +1,268 @@
+"""
+Role: This is a maintenance tool. It moves old customer orders from the transactional (hot) tables to the
+archive (cold) tables.
+
+Responsibilities:
+- Selects orders older than a configurable age and moves them, together with their order details, payments,
+  and customer feedback, into customerOrderArchive, orderDetailArchive, paymentArchive, and customerfeedbackArchive.
+- Works in small batches. Each batch is its own short transaction, so the row locks are held only briefly and the
+  transactional path (e.g., create_customer_order_with_products) is not blocked for long.
+- Reports the number of rows moved per second and the resulting sizes of the hot and archive tables.
+
+* The archive tables can be in the same database or in a separate one (see DATABASE_URL_ARCHIVE in db.py).
+* It can be run from the command line, e.g., by a scheduled job:
+      python archive.py --older-than-days 365 --batch-size 500
+* It relies on an index on customerOrder.orderDate. The DDL scripts in container-volumes create it. A database that
+  was created before the index was added needs it created once by hand:
+      CREATE INDEX ix_customerOrder_orderDate ON customerOrder (orderDate);
+
+Takeaway: The transactional tables stay small, so their indexes and lock scans stay fast as history accumulates.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, insert, delete, func, text
+from sqlalchemy.orm import Session
+
+from db import SessionLocal, ArchiveSessionLocal, engine, archive_engine, ArchiveBase
+from models import *
+
+# Orders older than this are moved to the archive tables.
+ARCHIVE_AFTER_DAYS = 365
+
+# Number of orders moved per transaction. Smaller batches hold locks for a shorter time.
+ARCHIVE_BATCH_SIZE = 500
+
+# Pause between batches so that the transactional workload gets a chance to run.
+ARCHIVE_PAUSE_SECONDS = 0.1
+
+# (hot model, archive model) pairs. The child tables are listed before customerOrder because their rows must be
+# deleted from the hot tables before the order header that they reference.
+ARCHIVED_TABLES = [
+    (OrderDetail, OrderDetailArchive),
+    (Payment, PaymentArchive),
+    (CustomerFeedback, CustomerFeedbackArchive),
+    (CustomerOrder, CustomerOrderArchive),
+]
+
+
+def archive_old_orders(
+    session: Session,
+    archive_session: Session,
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    pause_seconds: float = ARCHIVE_PAUSE_SECONDS,
+    max_batches: Optional[int] = None
+) -> Dict:
+    """
+    Move orders placed more than `older_than_days` ago from the hot tables to the archive tables.
+
+    Strategy (repeated once per batch):
+    1. Start a short transaction on the hot database.
+    2. Lock the next `batch_size` oldest orders (SELECT ... FOR UPDATE SKIP LOCKED). They are taken in orderDate
+       order so that the scan of the orderDate index stops after `batch_size` rows instead of locking every old
+       (or recent) order on the way. Orders that another transaction is holding are skipped instead of waited for;
+       they will be picked up by a later run.
+    3. Read their order details, payments, and customer feedback.
+    4. Write the rows into the archive tables.
+    5. Delete the rows from the hot tables (children first, then the order header) and commit.
+
+    If `archive_session` is the same object as `session`, steps 4 and 5 are one atomic transaction.
+    If the archive is a separate database, the archive transaction commits first. Should the hot transaction then
+    fail, the orders remain in the hot tables and the next run archives them again; any copies already in the
+    archive tables are replaced, so the archive tables never hold the same row twice. (Readers can still see an
+    order in both places for a moment; get_customer_orders_by_date_range in services.py keeps only the hot copy.)
+
+    Returns a summary with the number of orders and rows moved, the rows moved per second, and the table sizes.
+    The rate is based on the time spent inside the batch transactions only; the pauses between batches are
+    reported separately as `pause_seconds_total`.
+    """
+    if older_than_days < 0:
+        return {"error": "older_than_days must be >= 0"}
+    if batch_size <= 0:
+        return {"error": "batch_size must be > 0"}
+
+    cutoff_date = datetime.now() - timedelta(days=older_than_days)
+    same_database = archive_session is session
+
+    moved_rows = {hot_model.__tablename__: 0 for hot_model, _ in ARCHIVED_TABLES}
+    orders_moved = 0
+    batches = 0
+    work_seconds = 0.0
+    paused_seconds = 0.0
+
+    try:
+        while max_batches is None or batches < max_batches:
+            batch_started = time.perf_counter()
+            try:
+                with session.begin():
+                    order_numbers = session.execute(
+                        select(CustomerOrder.orderNumber)
+                        .where(CustomerOrder.orderDate < cutoff_date)
+                        .order_by(CustomerOrder.orderDate, CustomerOrder.orderNumber)
+                        .limit(batch_size)
+                        .with_for_update(skip_locked=True)
+                    ).scalars().all()
+
+                    if not order_numbers:
+                        break
+
+                    rows = {
+                        hot_model: session.execute(
+                            select(hot_model.__table__).where(hot_model.orderNumber.in_(order_numbers))
+                        ).mappings().all()
+                        for hot_model, _ in ARCHIVED_TABLES
+                    }
+
+                    if same_database:
+                        _copy_to_archive(session, rows, order_numbers)
+                    else:
+                        with archive_session.begin():
+                            _copy_to_archive(archive_session, rows, order_numbers)
+
+                    for hot_model, _ in ARCHIVED_TABLES:
+                        session.execute(delete(hot_model).where(hot_model.orderNumber.in_(order_numbers)))
+            finally:
+                work_seconds += time.perf_counter() - batch_started
+
+            for hot_model, _ in ARCHIVED_TABLES:
+                moved_rows[hot_model.__tablename__] += len(rows[hot_model])
+            orders_moved += len(order_numbers)
+            batches += 1
+
+            if len(order_numbers) < batch_size:
+                break
+            if pause_seconds:
+                time.sleep(pause_seconds)
+                paused_seconds += pause_seconds
+
+    except Exception as exc:
+        # The batch that failed has been rolled back by session.begin(). Batches committed before it stay archived.
+        return {
+            "error": "Failed to archive orders",
+            "details": str(exc),
+            "orders_moved": orders_moved,
+            "rows_moved": moved_rows,
+        }
+
+    total_rows = sum(moved_rows.values())
+
+    return {
+        "message": "Archival completed",
+        "cutoff_date": cutoff_date.strftime("%Y-%m-%d %H:%M:%S"),
+        "batches": batches,
+        "orders_moved": orders_moved,
+        "rows_moved": moved_rows,
+        "work_seconds": round(work_seconds, 3),
+        "pause_seconds_total": round(paused_seconds, 3),
+        "rows_per_second": round(total_rows / work_seconds, 2) if work_seconds > 0 else 0.0,
+        "table_sizes": get_table_sizes(session, archive_session),
+    }
+
+
+def _copy_to_archive(archive_session: Session, rows: Dict, order_numbers: List[int]):
+    archived_at = datetime.now()
+    for hot_model, archive_model in ARCHIVED_TABLES:
+        # Replace any copies left behind by an earlier run whose hot transaction did not commit
+        archive_session.execute(delete(archive_model).where(archive_model.orderNumber.in_(order_numbers)))
+        if rows[hot_model]:
+            archive_session.execute(
+                insert(archive_model),
+                [{**row, "archivedAt": archived_at} for row in rows[hot_model]]
+            )
+
+
+def get_table_sizes(session: Session, archive_session: Session) -> Dict:
+    """
+    Return the number of rows and, where the database reports it, the size in bytes (data + indexes)
+    of each hot table and its archive table.
+
+    Example:
+      {"customerOrder": {"rows": 1200, "bytes": 98304}, "customerOrderArchive": {"rows": 8800, "bytes": 655360}, ...}
+    """
+    sizes = {}
+    for hot_model, archive_model in ARCHIVED_TABLES:
+        for target_session, model in ((session, hot_model), (archive_session, archive_model)):
+            sizes[model.__tablename__] = {
+                "rows": target_session.execute(select(func.count()).select_from(model)).scalar_one(),
+                "bytes": _table_size_bytes(target_session, model.__tablename__),
+            }
+    return sizes
+
+
+def _table_size_bytes(session: Session, table_name: str):
+    # InnoDB and PostgreSQL both report an estimate. SQLite does not report sizes per table.
+    dialect = session.get_bind().dialect.name
+    if dialect == "mysql":
+        query = text(
+            "SELECT data_length + index_length FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND LOWER(table_name) = LOWER(:table_name)"
+        )
+    elif dialect == "postgresql":
+        query = text(
+            "SELECT pg_total_relation_size(c.oid) FROM pg_class c "
+            "WHERE c.relkind = 'r' AND c.relnamespace = current_schema()::regnamespace "
+            "AND LOWER(c.relname) = LOWER(:table_name)"
+        )
+    else:
+        return None
+
+    size = session.execute(query, {"table_name": table_name}).scalar()
+    return int(size) if size is not None else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move old customer orders to the archive tables.")
+    parser.add_argument("--older-than-days", type=int, default=ARCHIVE_AFTER_DAYS,
+                        help=f"Archive orders placed more than this many days ago (default: {ARCHIVE_AFTER_DAYS})")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE,
+                        help=f"Number of orders moved per transaction (default: {ARCHIVE_BATCH_SIZE})")
+    parser.add_argument("--pause-seconds", type=float, default=ARCHIVE_PAUSE_SECONDS,
+                        help=f"Pause between batches (default: {ARCHIVE_PAUSE_SECONDS})")
+    parser.add_argument("--max-batches", type=int, default=None,
+                        help="Stop after this many batches (default: run until no old orders remain)")
+    args = parser.parse_args()
+
+    ArchiveBase.metadata.create_all(bind=archive_engine)
+
+    session = SessionLocal()
+    # Use one session for both when the archive tables are in the transactional database
+    archive_session = session if archive_engine is engine else ArchiveSessionLocal()
+    try:
+        result = archive_old_orders(
+            session,
+            archive_session,
+            older_than_days=args.older_than_days,
+            batch_size=args.batch_size,
+            pause_seconds=args.pause_seconds,
+            max_batches=args.max_batches
+        )
+    finally:
+        session.close()
+        archive_session.close()
+
+    if "error" in result:
+        if result.get("details"):
+            print(f"{result['error']}: {result['details']}")
+        else:
+            print(result["error"])
+        if result.get("orders_moved"):
+            print(f"Orders moved before the error: {result['orders_moved']}")
+        return
+
+    print(f"Archived {result['orders_moved']} orders placed before {result['cutoff_date']} "
+          f"in {result['batches']} batches ({result['work_seconds']} s of work, "
+          f"{result['pause_seconds_total']} s of pauses)")
+    for table_name, count in result["rows_moved"].items():
+        print(f"  {table_name}: {count} rows moved")
+    print(f"Rate: {result['rows_per_second']} rows/sec")
+    print("Table sizes:")
+    for table_name, size in result["table_sizes"].items():
+        size_bytes = f", {size['bytes']} bytes" if size["bytes"] is not None else ""
+        print(f"  {table_name}: {size['rows']} rows{size_bytes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ Role: This forms part of the ORM layer. It defines the database schema and maps
 """
 from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Numeric, Text
 from sqlalchemy.orm import relationship
-from db import Base
+from db import Base, ArchiveBase
 
 class Order(Base):
     __tablename__ = "orders"
@@ -85,7 +85,7 @@ class OrderStatus(Base):
 class CustomerOrder(Base):
     __tablename__ = "customerOrder"
     orderNumber = Column(Integer, primary_key=True, autoincrement=True)
-    orderDate = Column(DateTime, nullable=False)
+    orderDate = Column(DateTime, nullable=False, index=True)
     requiredDate = Column(DateTime, nullable=False)
     dispatchDate = Column(DateTime)
     orderStatusID = Column(Integer, ForeignKey("orderStatus.orderStatusID", ondelete="RESTRICT", onupdate="CASCADE"),
@@ -174,3 +174,52 @@ class CustomerFeedback(Base):
     comment = Column(Text)
 
     customer_order = relationship("CustomerOrder", back_populates="customer_feedback")
+
+
+# Archive tables (cold storage)
+# These mirror customerOrder, orderDetail, payment, and customerfeedback column-for-column so that rows can be copied
+# across as they are. They keep the original primary keys, and they have no foreign keys because they may live in a
+# separate database (see DATABASE_URL_ARCHIVE in db.py). The archivedAt column records when a row was moved.
+
+class CustomerOrderArchive(ArchiveBase):
+    __tablename__ = "customerOrderArchive"
+    orderNumber = Column(Integer, primary_key=True, autoincrement=False)
+    orderDate = Column(DateTime, nullable=False, index=True)
+    requiredDate = Column(DateTime, nullable=False)
+    dispatchDate = Column(DateTime)
+    orderStatusID = Column(Integer, nullable=False)
+    customerNumber = Column(Integer, nullable=False)
+    branchCode = Column(Integer, nullable=False)
+    archivedAt = Column(DateTime, nullable=False)
+
+
+class PaymentArchive(ArchiveBase):
+    __tablename__ = "paymentArchive"
+    paymentNumber = Column(Integer, primary_key=True, autoincrement=False)
+    orderNumber = Column(Integer, nullable=False, index=True)
+    paymentDate = Column(DateTime, nullable=False)
+    amount = Column(Numeric(10, 2), nullable=False)
+    paymentMethodID = Column(Integer, nullable=False)
+    archivedAt = Column(DateTime, nullable=False)
+
+
+class OrderDetailArchive(ArchiveBase):
+    __tablename__ = "orderDetailArchive"
+    orderDetailNumber = Column(Integer, primary_key=True, autoincrement=False)
+    orderNumber = Column(Integer, nullable=False, index=True)
+    productCode = Column(String(20), nullable=False)
+    quantityOrdered = Column(Integer, nullable=False)
+    priceEach = Column(Numeric(10, 2), nullable=False)
+    archivedAt = Column(DateTime, nullable=False)
+
+
+class CustomerFeedbackArchive(ArchiveBase):
+    __tablename__ = "customerfeedbackArchive"
+    customerfeedbackID = Column(Integer, primary_key=True, autoincrement=False)
+    foodquality = Column(Integer)
+    servicequality = Column(Integer)
+    pricetovalue = Column(Integer)
+    ambiance = Column(Integer)
+    orderNumber = Column(Integer, index=True)
+    comment = Column(Text)
+    archivedAt = Column(DateTime, nullable=False)
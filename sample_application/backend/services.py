@@ -13,7 +13,7 @@ Takeaway: This is your core backend, the part of the system that actually does t
 """
 from datetime import datetime, timedelta
 import sqlalchemy
-from sqlalchemy import exc
+from sqlalchemy import exc, func
 from sqlalchemy.orm import Session
 from models import *
 
@@ -286,3 +286,94 @@ def get_selling_price_by_product_code(session: Session, product_code: str):
 
     except sqlalchemy.exc.SQLAlchemyError as e:
         return {"error": str(e)}
+
+def get_customer_orders_by_date_range(session: Session, start_date: datetime, end_date: datetime,
+                                      archive_session: Session = None):
+    """
+    Retrieve the customer orders placed in [start_date, end_date), together with their order details and payments.
+
+    Old orders are moved to the archive tables by archive.py. The archive tables are read only when the date range
+    reaches back to (or before) the newest archived order; otherwise only the hot tables are read.
+    The results from both are combined and sorted by order date, so the caller does not need to know where
+    an order is stored. Each order has a "source" key set to "hot" or "archive".
+    An order can briefly exist in both places while archive.py is moving it (or longer, if the move failed halfway
+    with a separate archive database). In that case only the hot copy is returned.
+
+    `archive_session` is only needed when the archive tables are in a separate database (see db.py).
+    """
+    try:
+        if start_date >= end_date:
+            return {"error": "start_date must be before end_date"}
+
+        archive_session = archive_session or session
+
+        orders = _get_orders_from_tables(session, start_date, end_date,
+                                         CustomerOrder, OrderDetail, Payment, source="hot")
+
+        # The newest archived order date marks the boundary between the archive and the hot tables
+        newest_archived_date = archive_session.query(func.max(CustomerOrderArchive.orderDate)).scalar()
+        archive_read = newest_archived_date is not None and start_date <= newest_archived_date
+        if archive_read:
+            hot_order_numbers = {o["order_number"] for o in orders}
+            orders += [
+                o for o in _get_orders_from_tables(archive_session, start_date, end_date,
+                                                   CustomerOrderArchive, OrderDetailArchive, PaymentArchive,
+                                                   source="archive")
+                if o["order_number"] not in hot_order_numbers
+            ]
+
+        orders.sort(key=lambda o: (o["order_date"], o["order_number"]))
+
+        return {
+            "start_date": start_date.strftime("%Y-%m-%d %H:%M:%S"),
+            "end_date": end_date.strftime("%Y-%m-%d %H:%M:%S"),
+            "archive_read": archive_read,
+            "count": len(orders),
+            "orders": orders
+        }
+
+    except sqlalchemy.exc.SQLAlchemyError as e:
+        return {"error": str(e)}
+
+def _get_orders_from_tables(session: Session, start_date: datetime, end_date: datetime,
+                            order_model, detail_model, payment_model, source: str) -> List[Dict]:
+    customer_orders = (
+        session.query(order_model)
+        .filter(order_model.orderDate >= start_date, order_model.orderDate < end_date)
+        .all()
+    )
+    if not customer_orders:
+        return []
+
+    order_numbers = [co.orderNumber for co in customer_orders]
+    orders = {
+        co.orderNumber: {
+            "order_number": co.orderNumber,
+            "order_date": co.orderDate.strftime("%Y-%m-%d %H:%M:%S"),
+            "customer_number": co.customerNumber,
+            "branch_code": co.branchCode,
+            "order_status_id": co.orderStatusID,
+            "source": source,
+            "items": [],
+            "payments": []
+        }
+        for co in customer_orders
+    }
+
+    # One query per child table for the whole range (instead of one per order)
+    for od in session.query(detail_model).filter(detail_model.orderNumber.in_(order_numbers)).all():
+        orders[od.orderNumber]["items"].append({
+            "product_code": od.productCode,
+            "quantity": od.quantityOrdered,
+            "unit_price": float(od.priceEach)
+        })
+
+    for p in session.query(payment_model).filter(payment_model.orderNumber.in_(order_numbers)).all():
+        orders[p.orderNumber]["payments"].append({
+            "payment_number": p.paymentNumber,
+            "payment_date": p.paymentDate.strftime("%Y-%m-%d %H:%M:%S"),
+            "amount": float(p.amount),
+            "payment_method_id": p.paymentMethodID
+        })
+
+    return list(orders.values())